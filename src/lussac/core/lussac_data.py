@@ -1,17 +1,20 @@
 import copy
 import datetime
+import functools
 import logging
 import os
 import pathlib
 import shutil
+import stat
 import sys
 import tempfile
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import numba
 import numpy as np
 import numpy.typing as npt
 from plotly.offline.offline import get_plotlyjs
 from lussac.utils import Utils
+import lussac.utils.misc as misc
 import probeinterface.io
 import spikeinterface.core as si
 import spikeinterface.curation as scur
@@ -29,11 +32,12 @@ class LussacData:
 		_tmp_directory	The TemporaryDirectory object for Lussac.
 	"""
 
-	__slots__ = "recording", "sortings", "params", "_tmp_directory"
+	__slots__ = "recording", "sortings", "params", "_tmp_directory", "_spike_vector"
 	recording: si.BaseRecording
 	sortings: dict[str, si.BaseSorting]
 	params: dict[str, dict]
 	_tmp_directory: tempfile.TemporaryDirectory
+	_spike_vector: np.ndarray | None
 
 	def __init__(self, recording: si.BaseRecording, sortings: dict[str, si.BaseSorting], params: dict[str, dict]) -> None:
 		"""
@@ -59,6 +63,7 @@ class LussacData:
 		if 'si_global_job_kwargs' in params['lussac']:
 			si.set_global_job_kwargs(**params['lussac']['si_global_job_kwargs'])
 			numba.set_num_threads(si.get_global_job_kwargs()['n_jobs'])
+		misc._numba_warmup(1)  # Spawn numba's thread pool outside of the critical path.
 
 		targets = logging.StreamHandler(sys.stdout), logging.FileHandler(self.logs_folder / "lussac.logs")
 		targets[0].terminator = ''
@@ -67,6 +72,7 @@ class LussacData:
 		logging.info(f"\nRunning Lussac!\n{datetime.datetime.today().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
 
 		self._sanity_check()
+		self._spike_vector = None
 
 		Utils.sampling_frequency = recording.sampling_frequency
 		Utils.t_max = recording.get_num_frames()
@@ -130,6 +136,35 @@ class LussacData:
 
 		return len(self.sortings)
 
+	@property
+	def spike_vector(self) -> np.ndarray:
+		"""
+		Returns the spikes of all sortings packed into a single structured array,
+		sorted by sample index (one contiguous scan by time instead of one dict
+		lookup and spike vector per sorting). Computed lazily and cached: it
+		reflects the sortings as they were on first access.
+
+		@return spike_vector: np.ndarray (n_spikes_total)
+			Structured array with fields 'sample_index', 'unit_index',
+			'segment_index' and 'sorting_index' (index in the sortings dict).
+		"""
+
+		if self._spike_vector is None:
+			spike_vectors = [sorting.to_spike_vector() for sorting in self.sortings.values()]
+			packed = np.empty(sum(len(sv) for sv in spike_vectors), dtype=[('sample_index', np.int64), ('unit_index', np.int64), ('segment_index', np.int64), ('sorting_index', np.int64)])
+
+			offset = 0
+			for sorting_ind, spike_vector in enumerate(spike_vectors):
+				for spike_field in ('sample_index', 'unit_index', 'segment_index'):
+					packed[spike_field][offset:offset + len(spike_vector)] = spike_vector[spike_field]
+				packed['sorting_index'][offset:offset + len(spike_vector)] = sorting_ind
+				offset += len(spike_vector)
+
+			order = np.argsort(packed['sample_index'], kind="stable")
+			self._spike_vector = packed[order]
+
+		return self._spike_vector
+
 	def _sanity_check(self) -> None:
 		"""
 		Checks that everything seems correct in the recording and sortings.
@@ -196,9 +231,12 @@ class LussacData:
 		for name, path in sortings_path.items():
 			path = pathlib.Path(path)
 
-			if not path.exists():
+			try:  # One stat call answers both "exists" and "is a directory".
+				path_stat = os.stat(path)
+			except OSError:
 				raise FileNotFoundError(f"Could not find the sorting file {path}.")
-			elif path.is_dir() and (path / "spike_times.npy").exists():
+
+			if stat.S_ISDIR(path_stat.st_mode) and (path / "spike_times.npy").exists():
 				sorting = se.PhySortingExtractor(path)
 			else:
 				sorting = si.load_extractor(path, base_folder=True)
@@ -238,10 +276,18 @@ class LussacData:
 				if not isinstance(parameters, dict):
 					raise Exception(f"Error: params['lussac']['pipeline'][{module}][{category}] must map to a dict.")
 
-				categories = category.split(';')
+				categories = _split_category_key(category)
 
-				for cat in categories:
-					formatted_params[module][cat] = copy.deepcopy(parameters)
+				if len(categories) == 1:
+					formatted_params[module][category] = copy.deepcopy(parameters)
+				else:
+					# One deep copy for the first category, shallow copies for the others:
+					# each category keeps its own top-level dict (so modules can be
+					# parameterized independently) without O(n_categories) deep copies.
+					parameters = copy.deepcopy(parameters)
+					formatted_params[module][categories[0]] = parameters
+					for cat in categories[1:]:
+						formatted_params[module][cat] = parameters.copy()
 
 		return formatted_params
 
@@ -318,6 +364,7 @@ class MonoSortingData:
 
 	data: LussacData
 	sorting: si.BaseSorting
+	_spike_trains: dict[int, np.ndarray] = field(default_factory=dict)
 
 	@property
 	def recording(self) -> si.BaseRecording:
@@ -379,13 +426,19 @@ class MonoSortingData:
 		"""
 		Returns the spike_train (i.e. an array containing all the spike timings)
 		of a given unit.
+		The spike trains are cached as int64 arrays: the contamination/coincidence
+		functions fetch the same unit many times, and the extractor re-parses the
+		segments on every call.
 
 		@param unit_id: int
 			The cluster's ID of which to return the spike train.
 		@return spike_train: np.ndarray
 		"""
 
-		return self.sorting.get_unit_spike_train(unit_id)
+		if unit_id not in self._spike_trains:
+			self._spike_trains[unit_id] = self.sorting.get_unit_spike_train(unit_id).astype(np.int64, copy=False)
+
+		return self._spike_trains[unit_id]
 
 
 @dataclass(slots=True)
@@ -445,3 +498,18 @@ class MultiSortingsData:
 		"""
 
 		return self.data.logs_folder
+
+
+@functools.lru_cache(maxsize=32)
+def _split_category_key(category: str) -> tuple[str, ...]:
+	"""
+	Splits a pipeline category key on semicolons.
+	Memoized: the same composite keys come back every time the params are (re)loaded.
+
+	@param category: str
+		The category key (e.g. "cat2;cat3").
+	@return categories: tuple[str, ...]
+		The individual categories.
+	"""
+
+	return tuple(category.split(';'))
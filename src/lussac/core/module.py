@@ -1,9 +1,10 @@
 import copy
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import pathlib
 import shutil
-from typing import Any
+import threading
+from typing import Any, ClassVar
 import numpy as np
 from lussac.core import MonoSortingData, MultiSortingsData
 import lussac.utils as utils
@@ -31,6 +32,13 @@ class LussacModule(ABC):
 	category: str
 	export_sortings: bool = True
 
+	# Filtered recordings already saved to disk, shared between all modules
+	# (keyed by the data's temporary folder and the filter band).
+	# The lock makes sure only one thread filters and saves a given band
+	# (recording.save asserts that the folder doesn't already exist).
+	_filtered_recordings: ClassVar[dict[tuple, si.BaseRecording]] = {}
+	_filtered_recordings_lock: ClassVar[threading.Lock] = threading.Lock()
+
 	@property
 	def recording(self) -> si.BaseRecording:
 		"""
@@ -113,11 +121,33 @@ class LussacModule(ABC):
 		recording = self.recording
 		if filter is not None:
 			assert len(filter) == 2, "The filter must be a list of 2 elements [min_cutoff, max_cutoff] (in Hz)."
-			recording = spre.gaussian_filter(recording, *filter, margin_sd=2)
+			recording = self._get_filtered_recording(tuple(filter))
 
 		sorting = sorting.to_numpy_sorting()  # Convert sorting for faster extraction.
 		return si.extract_waveforms(recording, sorting, folder_path, allow_unfiltered=True, **params)
 
+	def _get_filtered_recording(self, filter_band: tuple[float, float]) -> si.BaseRecording:
+		"""
+		Returns the Gaussian-filtered recording, cached as a binary file on disk.
+		A lazily filtered recording recomputes the filter on every get_traces call,
+		so the first call saves the filtered traces to the temporary folder and
+		subsequent calls (from any module) reuse the memory-mapped copy.
+
+		@param filter_band: tuple[float, float]
+			The cutoff frequencies for the Gaussian bandpass filter (in Hz).
+		@return filtered_recording: BaseRecording
+			The filtered recording, backed by a binary file.
+		"""
+
+		key = (str(self.data.tmp_folder), filter_band)
+		with LussacModule._filtered_recordings_lock:
+			if key not in LussacModule._filtered_recordings:
+				recording = spre.gaussian_filter(self.recording, *filter_band, margin_sd=2)
+				folder = self.data.tmp_folder / "filtered_recordings" / f"{filter_band[0]}-{filter_band[1]}"
+				LussacModule._filtered_recordings[key] = recording.save(folder=folder, format="binary")
+
+			return LussacModule._filtered_recordings[key]
+
 
 @dataclass(slots=True)
 class MonoSortingModule(LussacModule):
@@ -134,13 +164,26 @@ class MonoSortingModule(LussacModule):
 
 	data: MonoSortingData
 
+	# Waveform extractors already computed by this module, keyed by the sorting's
+	# identity (name alone isn't enough: select_units keeps the parent's name) and
+	# the extraction parameters (the sub-folder is deliberately not part of the
+	# key: same sorting and parameters means same waveforms).
+	_wvf_cache: dict[tuple, tuple[si.WaveformExtractor, pathlib.Path]] = field(default_factory=dict)
+
+	# Lazily resolved on first access (the mkdir and path joins run once per module).
+	_logs_folder: pathlib.Path | None = None
+	_tmp_folder: pathlib.Path | None = None
+
 	def __del__(self) -> None:
 		"""
-		When the module is garbage collected, remove the temporary folder.
+		When the module is garbage collected, remove its temporary folder.
+		Only this instance's per-sorting folder is removed: the parent folders
+		are shared with the module's other instances (e.g. when running with 'n_jobs').
 		"""
 
-		if (self.data.tmp_folder / self.name).exists():
-			shutil.rmtree(self.data.tmp_folder / self.name)
+		tmp_folder = self.data.tmp_folder / self.name / self.category / self.data.name
+		if tmp_folder.exists():
+			shutil.rmtree(tmp_folder)
 
 	@property
 	def sorting(self) -> si.BaseSorting:
@@ -162,10 +205,11 @@ class MonoSortingModule(LussacModule):
 			Path to the logs directory.
 		"""
 
-		logs_folder = self.data.logs_folder / self.name / self.category / self.data.name
-		logs_folder.mkdir(parents=True, exist_ok=True)
+		if self._logs_folder is None:
+			self._logs_folder = self.data.logs_folder / self.name / self.category / self.data.name
+			self._logs_folder.mkdir(parents=True, exist_ok=True)
 
-		return logs_folder
+		return self._logs_folder
 
 	@property
 	def tmp_folder(self) -> pathlib.Path:
@@ -176,10 +220,11 @@ class MonoSortingModule(LussacModule):
 			Path to the temporary directory.
 		"""
 
-		tmp_folder = self.data.tmp_folder / self.name / self.category / self.data.name
-		tmp_folder.mkdir(parents=True, exist_ok=True)
+		if self._tmp_folder is None:
+			self._tmp_folder = self.data.tmp_folder / self.name / self.category / self.data.name
+			self._tmp_folder.mkdir(parents=True, exist_ok=True)
 
-		return tmp_folder
+		return self._tmp_folder
 
 	@abstractmethod
 	def run(self, params: dict[str, Any]) -> si.BaseSorting:
@@ -189,12 +234,29 @@ class MonoSortingModule(LussacModule):
 		"""
 		Calls the parent LussacModule.extract_waveforms
 		'sorting' argument is optional. If None (default), will take the MonoSortingModule.data.sorting
+		Identical extractions (same sorting and parameters, different sub-folder) are served
+		from a cache: the waveforms folder is copied rather than extracted again.
 		"""
 
 		if sorting is None:
 			sorting = self.sorting
 
-		return super(MonoSortingModule, self).extract_waveforms(sorting, sub_folder, filter, **params)
+		key = (sorting.get_annotation("name"), tuple(sorting.unit_ids), sorting.to_spike_vector().size,
+			   None if filter is None else tuple(filter),
+			   tuple(sorted((k, repr(v)) for k, v in params.items() if k != 'overwrite')))
+		folder_path = pathlib.Path(f"{self.data.tmp_folder}/{self.name}/{self.category}/{sorting.get_annotation('name')}/{sub_folder if sub_folder is not None else 'wvf_extractor'}")
+
+		if key in self._wvf_cache:
+			wvf_extractor, cached_folder = self._wvf_cache[key]
+			if folder_path != cached_folder and not folder_path.is_dir():
+				shutil.copytree(cached_folder, folder_path)
+
+			return wvf_extractor
+
+		wvf_extractor = super(MonoSortingModule, self).extract_waveforms(sorting, sub_folder, filter, **params)
+		self._wvf_cache[key] = (wvf_extractor, folder_path)
+
+		return wvf_extractor
 
 	def get_templates(self, params: dict, filter_band: tuple[float, float] | list[float, float] | np.ndarray | None = None, margin: float = 3.0,
 					  sub_folder: str = "templates", return_extractor: bool = False) -> np.ndarray | tuple[np.ndarray, si.WaveformExtractor, int]:
@@ -289,15 +351,19 @@ class MonoSortingModule(LussacModule):
 		sorting = self.sorting
 		if 'filter' in params:
 			assert len(params['filter']) == 2, "The filter must be a list of 2 elements [min_cutoff, max_cutoff] (in Hz)."
-			recording = spre.gaussian_filter(recording, *params['filter'], margin_sd=2)
+			# Only the WaveformExtractor branch below reads the filtered traces: filtering
+			# and saving the whole recording would be wasted work when extracting waveforms.
+			recording = spre.gaussian_filter(recording, *params['filter'], margin_sd=2) if 'wvf_extraction' in params \
+						else self._get_filtered_recording(tuple(params['filter']))
 
 		wvf_extractor = self.extract_waveforms(sub_folder=attribute, **params['wvf_extraction']) if 'wvf_extraction' in params \
 						else si.WaveformExtractor(recording, sorting, allow_unfiltered=True)
 
 		match attribute:
 			case "firing_rate":  # Returns the firing rate of each unit (in Hz).
-				n_spikes = {unit_id: len(sorting.get_unit_spike_train(unit_id)) for unit_id in sorting.unit_ids}
-				firing_rates = {unit_id: n_spike * sorting.get_sampling_frequency() / recording.get_num_frames() for unit_id, n_spike in n_spikes.items()}
+				spike_vector = sorting.to_spike_vector()
+				n_spikes = np.bincount(spike_vector['unit_index'], minlength=sorting.get_num_units())
+				firing_rates = {unit_id: n_spikes[unit_ind] * sorting.get_sampling_frequency() / recording.get_num_frames() for unit_ind, unit_id in enumerate(sorting.unit_ids)}
 				return firing_rates
 
 			case "contamination":  # Returns the estimated contamination of each unit.
@@ -322,8 +388,17 @@ class MonoSortingModule(LussacModule):
 
 			case "ISI_portion":  # Returns the portion of consecutive spikes that are between a certain range (in ms).
 				low, high = np.array(params['range']) * recording.sampling_frequency * 1e-3
-				diff = {unit_id: np.diff(sorting.get_unit_spike_train(unit_id)) for unit_id in sorting.unit_ids}
-				ISI_portion = {unit_id: np.nan if len(d) == 0 else (np.sum((low < d) & (d < high)) / len(d)) for unit_id, d in diff.items()}
+				spike_vector = sorting.to_spike_vector()
+				spike_trains = utils.misc.spike_vector_to_spike_trains(spike_vector['sample_index'].astype(np.int64, copy=False),
+																	   spike_vector['unit_index'].astype(np.int64, copy=False))
+
+				ISI_portion = {}
+				for unit_ind, unit_id in enumerate(sorting.unit_ids):
+					if unit_ind >= len(spike_trains) or len(spike_trains[unit_ind]) < 2:
+						ISI_portion[unit_id] = np.nan
+					else:
+						d = np.diff(spike_trains[unit_ind])
+						ISI_portion[unit_id] = np.sum((low < d) & (d < high)) / len(d)
 				return ISI_portion
 
 			case _:  # pragma: no cover (unreachable code)
@@ -353,6 +428,10 @@ class MultiSortingsModule(LussacModule):
 
 	data: MultiSortingsData
 
+	# Lazily resolved on first access (see MonoSortingModule).
+	_logs_folder: pathlib.Path | None = None
+	_tmp_folder: pathlib.Path | None = None
+
 	@property
 	def sortings(self) -> dict[str, si.BaseSorting]:
 		"""
@@ -373,10 +452,11 @@ class MultiSortingsModule(LussacModule):
 			Path to the logs directory.
 		"""
 
-		logs_folder = self.data.logs_folder / self.name / self.category
-		logs_folder.mkdir(parents=True, exist_ok=True)
+		if self._logs_folder is None:
+			self._logs_folder = self.data.logs_folder / self.name / self.category
+			self._logs_folder.mkdir(parents=True, exist_ok=True)
 
-		return logs_folder
+		return self._logs_folder
 
 	@property
 	def tmp_folder(self) -> pathlib.Path:
@@ -387,10 +467,11 @@ class MultiSortingsModule(LussacModule):
 			Path to the temporary directory.
 		"""
 
-		tmp_folder = self.data.tmp_folder / self.name / self.category
-		tmp_folder.mkdir(parents=True, exist_ok=True)
+		if self._tmp_folder is None:
+			self._tmp_folder = self.data.tmp_folder / self.name / self.category
+			self._tmp_folder.mkdir(parents=True, exist_ok=True)
 
-		return tmp_folder
+		return self._tmp_folder
 
 	@abstractmethod
 	def run(self, params: dict[str, Any]) -> dict[str, si.BaseSorting]:
@@ -1,4 +1,5 @@
 import copy
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import glob
 import logging
@@ -77,11 +78,12 @@ class LussacPipeline:
 			Run the module only on units from this category.
 		@param params: dict
 			The parameters for the module.
+			The optional key 'n_jobs' runs the sortings through a thread pool
+			(the work is independent across sortings; NumPy and I/O release the GIL).
 		"""
 
-		for name, sorting in self.data.sortings.items():
-			if 'sortings' in params and name not in params['sortings']:
-				continue
+		def run_module(name: str) -> None:
+			sorting = self.data.sortings[name]
 
 			logging.info(f"\t- Sorting  {name:<18}")
 			t1 = time.perf_counter()
@@ -93,8 +95,9 @@ class LussacPipeline:
 			module_instance = module(module_name, data, category)
 			params0 = copy.deepcopy(params)
 			params0 = module_instance.update_params(params0)
-			if 'sortings' in params0:
-				del params0['sortings']
+			for key in ('sortings', 'n_jobs'):
+				if key in params0:
+					del params0[key]
 
 			sub_sorting = module_instance.run(params0)
 
@@ -103,6 +106,16 @@ class LussacPipeline:
 			t2 = time.perf_counter()
 			logging.info(f" (Done in {t2-t1:.1f} s)\n")
 
+		names = [name for name in self.data.sortings if 'sortings' not in params or name in params['sortings']]
+		n_jobs = params.get('n_jobs', 1)
+
+		if n_jobs == 1:
+			for name in names:
+				run_module(name)
+		else:
+			with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+				list(executor.map(run_module, names))
+
 	def _run_multi_sortings_module(self, module: Type[MultiSortingsModule], module_name: str, module_params: dict) -> None:
 		"""
 		Launches a multi-sorting module for a category.
@@ -214,15 +227,18 @@ class LussacPipeline:
 		categories = category.split('+')
 		for cat in categories:
 			if cat == "all":
-				unit_ids.extend(sorting.unit_ids)
+				unit_ids.append(sorting.unit_ids)
 			elif cat == "rest":
 				indices = np.where((units_category == '') | (units_category == None))[0]
-				unit_ids.extend(sorting.unit_ids[indices])
+				unit_ids.append(sorting.unit_ids[indices])
 			elif units_category is not None and len(units_category) > 0:
 				indices = np.where(units_category == cat)[0]
-				unit_ids.extend(sorting.unit_ids[indices])
+				unit_ids.append(sorting.unit_ids[indices])
+
+		if len(unit_ids) == 0:
+			return np.sort(np.unique(unit_ids))
 
-		return np.sort(np.unique(unit_ids))
+		return np.unique(np.concatenate(unit_ids))  # np.unique also sorts.
 
 	@staticmethod
 	def split_sorting(sorting: si.BaseSorting, unit_ids: npt.ArrayLike) -> tuple[si.BaseSorting, si.BaseSorting]:
@@ -237,7 +253,7 @@ class LussacPipeline:
 			The split sortings.
 		"""
 
-		other_unit_ids = [unit_id for unit_id in sorting.get_unit_ids() if unit_id not in unit_ids]
+		other_unit_ids = sorting.unit_ids[~np.isin(sorting.unit_ids, unit_ids)]
 		sorting1 = sorting.select_units(unit_ids)
 		sorting2 = sorting.select_units(other_unit_ids)
 
@@ -7,6 +7,11 @@ import json
 import jsmin
 from lussac.core import LussacData, LussacPipeline, LussacSpikeSorter
 
+try:
+	import orjson  # Optional: C-level JSON parsing for large params files.
+except ImportError:  # pragma: no cover (optional dependency)
+	orjson = None
+
 
 def parse_arguments(args: list | None) -> str:
 	"""
@@ -42,7 +47,7 @@ def load_json(filename: str) -> dict:
 		if platform.system() == "Windows":  # pragma: no cover (OS specific).
 			minified = minified.replace("\\", "\\\\")
 
-		return json.loads(minified)
+		return orjson.loads(minified) if orjson is not None else json.loads(minified)
 
 
 def main() -> None:  # pragma: no cover
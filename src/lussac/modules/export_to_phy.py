@@ -123,9 +123,10 @@ class ExportToPhy(MonoSortingModule):
 
 		path.parent.mkdir(parents=True, exist_ok=True)
 
-		with open(path, 'w+') as tsv_file:
-			tsv_file.write(f"cluster_id\t{name}")
-			for key, value in zip(keys, values):
-				tsv_file.write(f"\n{key}\t{value}")
+		# Build the whole table in memory and write it in one call (one syscall
+		# instead of one per unit).
+		lines = [f"cluster_id\t{name}"]
+		lines.extend(f"{key}\t{value}" for key, value in zip(keys, values))
 
-			tsv_file.close()
+		with open(path, 'w+') as tsv_file:
+			tsv_file.write('\n'.join(lines))
@@ -50,7 +50,12 @@ class FindPurkinjeCells(MonoSortingModule):
 
 		sorting = self.sorting.select_units([*putative_ss_units, *putative_cs_units])
 		correlograms, bins = spost.compute_correlograms(sorting, window_ms=25.0, bin_ms=1.0, method="numba")
-		mask = ((bins >= params['cross_corr_pause'][0]) & (bins < params['cross_corr_pause'][1]))[:-1]
+
+		# 'bins' is sorted, so the pause window and the baseline are slices rather than boolean masks.
+		n_bins = len(bins) - 1
+		lo, hi = np.searchsorted(bins, params['cross_corr_pause'], side='left')
+		hi = min(hi, n_bins)  # The correlograms have one entry fewer than the bin edges.
+		zero_ind = np.searchsorted(bins, 0.0, side='left')
 
 		ss_cs_pairs = []
 		for ss_id in putative_ss_units:
@@ -59,9 +64,9 @@ class FindPurkinjeCells(MonoSortingModule):
 				cs_ind = sorting.id_to_index(cs_id)
 				cross_corr = correlograms[ss_ind, cs_ind, :]
 
-				baseline = np.median(cross_corr[bins[:-1] < 0.0])
-				if np.median(cross_corr[mask]) < baseline * params['threshold']:  # Check for pause.
-					if np.median(cross_corr[mask[::-1]] < baseline * params['threshold']):  # Check for asymmetry.
+				baseline = np.median(cross_corr[:zero_ind])
+				if np.median(cross_corr[lo:hi]) < baseline * params['threshold']:  # Check for pause.
+					if np.median(cross_corr[n_bins-hi:n_bins-lo] < baseline * params['threshold']):  # Check for asymmetry.
 						continue
 					ss_cs_pairs.append((ss_id, cs_id))  # TODO: Also check templates?
 
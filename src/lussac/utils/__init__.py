@@ -1,4 +1,4 @@
-from .misc import (gaussian_pdf, filter_kwargs, flatten_dict, unflatten_dict, merge_dict, binom_sf, gaussian_histogram, estimate_contamination, estimate_cross_contamination, compute_nb_coincidence,
+from .misc import (gaussian_pdf, filter_kwargs, flatten_dict, unflatten_dict, merge_dict, binom_sf, gaussian_histogram, gaussian_histogram_batch, estimate_contamination, estimate_cross_contamination, compute_nb_coincidence,
 				   compute_coincidence_matrix, compute_coincidence_matrix_from_vector, compute_similarity_matrix, filter, compute_cross_shift_from_vector,
 				   compute_cross_shift, compute_correlogram_difference)
 from .plotting import get_path_to_plotlyJS, export_figure, plot_sliders, plot_units, create_gt_annotations, create_graph_plot
@@ -1,7 +1,10 @@
+import functools
 import inspect
 import math
 from typing import Any, Callable, TypeVar
+import scipy.fft
 import scipy.interpolate
+import scipy.ndimage
 import scipy.stats
 import numba
 import numpy as np
@@ -13,6 +16,29 @@ from spikeinterface.postprocessing.correlograms import _compute_crosscorr_numba
 
 T = TypeVar("T", bound=npt.ArrayLike)
 
+# Frozen as a compile-time constant inside the numba kernels (keeps them cacheable,
+# contrary to numba.get_num_threads() which is a runtime lookup).
+_N_THREADS = numba.config.NUMBA_NUM_THREADS
+
+
+@numba.jit((numba.int64, ), nopython=True, nogil=True, cache=True, parallel=True)
+def _numba_warmup(n):
+	"""
+	Trivial parallel kernel used to spawn numba's thread pool up front,
+	so that the first real kernel doesn't pay the pool-creation cost.
+
+	@param n: int
+		Number of iterations (anything small, e.g. 1024).
+	@return total: int
+		Sum of the iteration indices (meaningless; prevents dead-code elimination).
+	"""
+
+	total = 0
+	for i in numba.prange(n):
+		total += i
+
+	return total
+
 
 def gaussian_pdf(x: T, mu: float = 0.0, sigma: float = 1.0) -> T:
 	"""
@@ -156,7 +182,7 @@ def binom_sf(x: int, n: float, p: float) -> float:
 	n_array = np.arange(math.floor(n-2), math.ceil(n+3), 1)
 	n_array = n_array[n_array >= 0]
 
-	res = [scipy.stats.binom.sf(x, n_, p) for n_ in n_array]
+	res = scipy.stats.binom.sf(x, n_array, p)  # Vectorized over the trial counts.
 	f = scipy.interpolate.interp1d(n_array, res, kind="quadratic")
 
 	return f(n)
@@ -181,11 +207,56 @@ def gaussian_histogram(events: np.ndarray, t_axis: np.ndarray, sigma: float, tru
 		The histogram of the events.
 	"""
 
+	t_axis = t_axis.astype(np.float32)
+	events = _prepare_gaussian_events(events, t_axis, sigma, truncate, margin_reflect)
+
 	if len(events) == 0:
 		return np.zeros(len(t_axis), dtype=np.float32)
 
-	events = np.sort(events).astype(np.float32)
+	return _gaussian_kernel(events, t_axis, sigma, truncate)
+
+
+def gaussian_histogram_batch(events_list: list[np.ndarray], t_axis: np.ndarray, sigma: float, truncate: float = 5., margin_reflect: bool = False) -> npt.NDArray[np.float32]:
+	"""
+	Computes the gaussian histogram of multiple event arrays on a shared time axis.
+	Equivalent to calling gaussian_histogram on each array, but a single numba kernel
+	handles all of them (the launch/sync overhead dominates for many small arrays).
+
+	@param events_list: list[np.ndarray]
+		The event arrays to histogram (one per unit).
+	@param t_axis: np.ndarray (n_timepoints)
+		The time axis of the histogram (shared by all units).
+	@param sigma: float
+		The standard deviation of the gaussian kernel (same unit as 't_axis').
+	@param truncate: float
+		Truncate the gaussian kernel at 'truncate' standard deviation.
+	@param margin_reflect: bool
+		If true, will reflect the events at the margins.
+	@return histograms: np.ndarray[float32] (n_units, n_timepoints)
+		The histogram of each events array.
+	"""
+
 	t_axis = t_axis.astype(np.float32)
+	if len(events_list) == 0:
+		return np.zeros((0, len(t_axis)), dtype=np.float32)
+
+	prepared = [_prepare_gaussian_events(events, t_axis, sigma, truncate, margin_reflect) for events in events_list]
+	offsets = np.cumsum([0] + [len(events) for events in prepared], dtype=np.int64)
+	events = np.concatenate(prepared)
+
+	return _gaussian_kernel_batch(events, offsets, t_axis, sigma, truncate)
+
+
+def _prepare_gaussian_events(events: np.ndarray, t_axis: np.ndarray, sigma: float, truncate: float, margin_reflect: bool) -> npt.NDArray[np.float32]:
+	"""
+	Sorts the events (and reflects them at the margins if asked to)
+	before they are handed to the gaussian histogram kernels.
+	"""
+
+	if len(events) == 0:
+		return np.array([], dtype=np.float32)
+
+	events = np.sort(events).astype(np.float32)
 
 	if margin_reflect:
 		if np.min(events) >= t_axis[0]:
@@ -200,10 +271,10 @@ def gaussian_histogram(events: np.ndarray, t_axis: np.ndarray, sigma: float, tru
 
 		events = np.concatenate((events_low, events, events_high))
 
-	return _gaussian_kernel(events, t_axis, sigma, truncate)
+	return events
 
 
-@numba.jit((numba.float32[:], numba.float32[:], numba.float32, numba.float32), nopython=True, nogil=True, cache=True, parallel=True)
+@numba.jit((numba.float32[:], numba.float32[:], numba.float32, numba.float32), nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
 def _gaussian_kernel(events, t_axis, sigma, truncate) -> npt.NDArray[np.float32]:
 	"""
 	Numba function for gaussian_histogram.
@@ -222,20 +293,58 @@ def _gaussian_kernel(events, t_axis, sigma, truncate) -> npt.NDArray[np.float32]
 
 	histogram = np.zeros(t_axis.shape, dtype=np.float32)
 
-	start_j = 0
-	for i in numba.prange(len(t_axis)):
-		for e in events[start_j:]:
-			if e < t_axis[i] - truncate * sigma:
-				start_j += 1
-				continue
-			if e > t_axis[i] + truncate * sigma:
-				break
+	# Pre-compute each timepoint's window of nearby events: the prange loop is
+	# then free of shared state (the old start_j pointer was a race under parallel=True).
+	lo = np.searchsorted(events, t_axis - truncate * sigma, side='left')
+	hi = np.searchsorted(events, t_axis + truncate * sigma, side='right')
 
-			histogram[i] += np.exp(-0.5 * ((e - t_axis[i]) / sigma) ** 2)
+	inv_sigma = np.float32(1.0) / sigma
+	for i in numba.prange(len(t_axis)):
+		# Batching the window lets LLVM vectorize the exponential (fastmath).
+		d = (events[lo[i]:hi[i]] - t_axis[i]) * inv_sigma
+		histogram[i] = np.sum(np.exp(np.float32(-0.5) * d * d))
 
 	return histogram / (sigma * np.sqrt(2*np.pi))
 
 
+@numba.jit((numba.float32[:], numba.int64[:], numba.float32[:], numba.float32, numba.float32), nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def _gaussian_kernel_batch(events, offsets, t_axis, sigma, truncate) -> npt.NDArray[np.float32]:
+	"""
+	Numba function for gaussian_histogram_batch.
+
+	@param events: array[float32] (n_events_total)
+		The events of all units concatenated (ordered within each unit).
+	@param offsets: array[int64] (n_units + 1)
+		Unit u's events are events[offsets[u]:offsets[u+1]].
+	@param t_axis: array[float32] (n_timepoints)
+		The time axis of the histogram (shared by all units).
+	@param sigma: float32
+		The standard deviation of the gaussian kernel (same unit as 't_axis').
+	@param truncate: float32
+		Truncate the gaussian kernel at 'truncate' standard deviation.
+	@return histograms: array[float32] (n_units, n_timepoints)
+		The gaussian histogram of each unit's events.
+	"""
+
+	n_units = len(offsets) - 1
+	n_timepoints = len(t_axis)
+	histograms = np.zeros((n_units, n_timepoints), dtype=np.float32)
+
+	inv_sigma = np.float32(1.0) / sigma
+	# Parallelize over the flattened (unit, timepoint) grid so that small units
+	# don't leave threads idle.
+	for k in numba.prange(n_units * n_timepoints):
+		u = k // n_timepoints
+		i = k % n_timepoints
+		sub_events = events[offsets[u]:offsets[u+1]]
+		lo = np.searchsorted(sub_events, t_axis[i] - truncate * sigma, side='left')
+		hi = np.searchsorted(sub_events, t_axis[i] + truncate * sigma, side='right')
+		d = (sub_events[lo:hi] - t_axis[i]) * inv_sigma
+		histograms[u, i] = np.sum(np.exp(np.float32(-0.5) * d * d))
+
+	return histograms / (sigma * np.sqrt(2*np.pi))
+
+
 @numba.jit((numba.int64[:], numba.int64[:]), nopython=True, nogil=True, cache=True)
 def spike_vector_to_spike_trains(sample_indices, unit_indices) -> list[np.ndarray[np.int64]]:
 	"""
@@ -284,12 +393,17 @@ def estimate_contamination(spike_train: np.ndarray, refractory_period: tuple[flo
 		The estimated contamination between 0 and 1.
 	"""
 
-	t_c = refractory_period[0] * 1e-3 * Utils.sampling_frequency
-	t_r = refractory_period[1] * 1e-3 * Utils.sampling_frequency
-	n_v = compute_nb_violations(spike_train.astype(np.int64), t_r)
+	spike_train = np.ascontiguousarray(spike_train, dtype=np.int64)  # No-op if already int64 and contiguous.
+
+	sampling_frequency = Utils.sampling_frequency  # Hoisted: class-attribute lookups add up over thousands of units.
+	t_max = Utils.t_max
+
+	t_c = refractory_period[0] * 1e-3 * sampling_frequency
+	t_r = refractory_period[1] * 1e-3 * sampling_frequency
+	n_v = compute_nb_violations(spike_train, t_r)
 
 	N = len(spike_train)
-	D = 1 - n_v * (Utils.t_max - 2*N*t_c) / (N**2 * (t_r - t_c))
+	D = 1 - n_v * (t_max - 2*N*t_c) / (N**2 * (t_r - t_c))
 	contamination = 1.0 if D < 0 else 1 - math.sqrt(D)
 
 	return contamination
@@ -313,24 +427,28 @@ def estimate_cross_contamination(spike_train1: np.ndarray, spike_train2: np.ndar
 			estimated_cross_cont: float if limit is None
 		Returns the estimation of cross-contamination, as well as the p-value of the statistical test if the limit is given.
 	"""
-	spike_train1 = spike_train1.astype(np.int64, copy=False)
-	spike_train2 = spike_train2.astype(np.int64, copy=False)
+	spike_train1 = np.ascontiguousarray(spike_train1, dtype=np.int64)  # Cast once: estimate_contamination and the numba
+	spike_train2 = np.ascontiguousarray(spike_train2, dtype=np.int64)  # kernels then take the arrays without copy-in.
 
 	N1 = len(spike_train1)
 	N2 = len(spike_train2)
 	C1 = estimate_contamination(spike_train1, refractory_period)
 
-	t_c = refractory_period[0] * 1e-3 * Utils.sampling_frequency
-	t_r = refractory_period[1] * 1e-3 * Utils.sampling_frequency
-	n_violations = compute_nb_coincidence(spike_train1, spike_train2, t_r) - compute_nb_coincidence(spike_train1, spike_train2, t_c)
+	sampling_frequency = Utils.sampling_frequency
+	t_max = Utils.t_max
 
-	estimation = 1 - ((n_violations * Utils.t_max) / (2*N1*N2 * t_r) - 1) / (C1 - 1) if C1 != 1.0 else -np.inf
+	t_c = refractory_period[0] * 1e-3 * sampling_frequency
+	t_r = refractory_period[1] * 1e-3 * sampling_frequency
+	n_coincidence_c, n_coincidence_r = _compute_nb_coincidence_pair(spike_train1, spike_train2, t_c, t_r)
+	n_violations = n_coincidence_r - n_coincidence_c
+
+	estimation = 1 - ((n_violations * t_max) / (2*N1*N2 * t_r) - 1) / (C1 - 1) if C1 != 1.0 else -np.inf
 	if limit is None:
 		return estimation
 
 	# n and p for the binomial law for the number of coincidence (under the hypothesis of cross-contamination = limit).
 	n = N1 * N2 * ((1 - C1) * limit + C1)
-	p = 2 * t_r / Utils.t_max
+	p = 2 * t_r / t_max
 	p_value = binom_sf(int(n_violations - 1), n, p)
 	if np.isnan(p_value):  # pragma: no cover (should be unreachable).
 		raise ValueError(f"Could not compute p-value for cross-contamination:\n\tn_violations = {n_violations}\n\tn = {n}\n\tp = {p}")
@@ -338,7 +456,7 @@ def estimate_cross_contamination(spike_train1: np.ndarray, spike_train2: np.ndar
 	return estimation, p_value
 
 
-@numba.jit((numba.float32, ), nopython=True, nogil=True, cache=True)
+@numba.jit((numba.float32, ), nopython=True, nogil=True, cache=True, fastmath=True)
 def _get_border_probabilities(max_time) -> tuple[int, int, float, float]:
 	"""
 	Computes the integer borders, and the probability of 2 spikes distant by this border to be closer than max_time.
@@ -360,14 +478,24 @@ def _get_border_probabilities(max_time) -> tuple[int, int, float, float]:
 	return border_low, border_high, p_low, p_high
 
 
-@numba.jit((numba.int64[:], numba.float32), nopython=True, nogil=True, cache=True)
-def compute_nb_violations(spike_train, max_time) -> float:
+@functools.lru_cache(maxsize=64)
+def _get_border_probabilities_cached(max_time: float) -> tuple[int, int, float, float]:
+	"""
+	Memoized Python-side entry point for _get_border_probabilities: max_time only
+	takes a handful of distinct values per run but the counting functions are
+	called once per unit pair.
+	"""
+
+	return _get_border_probabilities(np.float32(max_time))
+
+
+def compute_nb_violations(spike_train: np.ndarray, max_time: float) -> float:
 	"""
 	Computes the number of refractory period violations in a spike train.
 
 	@param spike_train: array[int64] (n_spikes)
 		The spike train to compute the number of violations for.
-	@param max_time: float32
+	@param max_time: float
 		The maximum time to consider for violations (in number of samples).
 	@return n_violations: float
 		The number of spike pairs that violate the refractory period.
@@ -376,29 +504,41 @@ def compute_nb_violations(spike_train, max_time) -> float:
 	if max_time <= 0.0:
 		return 0.0
 
-	border_low, border_high, p_low, p_high = _get_border_probabilities(max_time)
-	n_violations = 0
-	n_violations_low = 0
-	n_violations_high = 0
+	border_low, border_high, p_low, p_high = _get_border_probabilities_cached(float(max_time))
+	return _compute_nb_violations(spike_train, border_low, border_high, p_low, p_high)
 
-	for i in range(len(spike_train)-1):
-		for j in range(i+1, len(spike_train)):
-			diff = spike_train[j] - spike_train[i]
 
-			if diff > border_high:
-				break
-			if diff == border_high:
-				n_violations_high += 1
-			elif diff == border_low:
-				n_violations_low += 1
-			else:
-				n_violations += 1
+@numba.jit((numba.int64[:], numba.int64, numba.int64, numba.float64, numba.float64), nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def _compute_nb_violations(spike_train, border_low, border_high, p_low, p_high) -> float:
+	"""
+	Kernel for compute_nb_violations: the borders are computed once in Python
+	(they only depend on max_time, which takes a handful of values per run)
+	and passed in, so the kernel only does the counting.
+	"""
+
+	# The spike train is sorted, so the pairs within the window can be counted
+	# with binary searches (one linear pass instead of a doubly-nested loop).
+	high_right = np.searchsorted(spike_train, spike_train + border_high, side='right')
+	high_left  = np.searchsorted(spike_train, spike_train + border_high, side='left')
+
+	n_pairs = np.sum(high_right) - len(spike_train) * (len(spike_train) + 1) // 2  # Pairs (i, j>i) with diff <= border_high.
+	n_violations_high = np.sum(high_right - high_left)  # Pairs with diff == border_high.
+
+	if border_low == border_high:  # Integer max_time: the 'high' count already covers the border.
+		n_violations_low = 0
+	elif border_low == 0:
+		n_violations_low = np.sum(np.searchsorted(spike_train, spike_train, side='right') - np.arange(1, len(spike_train) + 1))
+	else:
+		low_right = np.searchsorted(spike_train, spike_train + border_low, side='right')
+		low_left  = np.searchsorted(spike_train, spike_train + border_low, side='left')
+		n_violations_low = np.sum(low_right - low_left)
+
+	n_violations = n_pairs - n_violations_high - n_violations_low
 
 	return n_violations + p_high*n_violations_high + p_low*n_violations_low
 
 
-@numba.jit((numba.int64[:], numba.int64[:], numba.float32), nopython=True, nogil=True, cache=True)
-def compute_nb_coincidence(spike_train1, spike_train2, max_time) -> float:
+def compute_nb_coincidence(spike_train1: np.ndarray, spike_train2: np.ndarray, max_time: float) -> float:
 	"""
 	Computes the number of coincident spikes between two spike trains.
 	Spike timings are integers, so their real timing follows a uniform distribution between t - dt/2 and t + dt/2.
@@ -412,7 +552,7 @@ def compute_nb_coincidence(spike_train1, spike_train2, max_time) -> float:
 		The spike train of the first unit.
 	@param spike_train2: array[int64] (n_spikes2)
 		The spike train of the second unit.
-	@param max_time: float32
+	@param max_time: float
 		The maximum time to consider for coincidence (in number samples).
 	@return n_coincidence: float
 		The number of coincident spikes.
@@ -421,31 +561,105 @@ def compute_nb_coincidence(spike_train1, spike_train2, max_time) -> float:
 	if max_time <= 0:
 		return 0.0
 
-	border_low, border_high, p_low, p_high = _get_border_probabilities(max_time)
+	border_low, border_high, p_low, p_high = _get_border_probabilities_cached(float(max_time))
+	return _compute_nb_coincidence(spike_train1, spike_train2, border_low, border_high, p_low, p_high)
+
+
+@numba.jit((numba.int64[:], numba.int64[:], numba.int64, numba.int64, numba.float64, numba.float64), nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def _compute_nb_coincidence(spike_train1, spike_train2, border_low, border_high, p_low, p_high) -> float:
+	"""
+	Kernel for compute_nb_coincidence: takes the precomputed borders
+	(see _compute_nb_violations) and only does the counting.
+	"""
+
 	n_coincident = 0
 	n_coincident_low = 0
 	n_coincident_high = 0
 
-	start_j = 0
-	for i in range(len(spike_train1)):
-		for j in range(start_j, len(spike_train2)):
-			diff = spike_train1[i] - spike_train2[j]
+	# Pre-compute each spike's coincidence window so that the outer loop carries
+	# no state between iterations and can be parallelized.
+	starts = np.searchsorted(spike_train2, spike_train1 - border_high, side='left')
+	ends   = np.searchsorted(spike_train2, spike_train1 + border_high, side='right')
 
-			if diff > border_high:
-				start_j += 1
-				continue
-			if diff < -border_high:
-				break
-			if abs(diff) == border_high:
-				n_coincident_high += 1
-			elif abs(diff) == border_low:
-				n_coincident_low += 1
-			else:
-				n_coincident += 1
+	for i in numba.prange(len(spike_train1)):
+		for j in range(starts[i], ends[i]):
+			diff = abs(spike_train1[i] - spike_train2[j])
+
+			# Branchless counter updates: spike differences look random, so an
+			# if/elif chain here would mispredict on nearly every pair.
+			# border_low == border_high for integer max_time: the second comparison makes 'high' win, as the elif did.
+			eq_high = np.int64(diff == border_high)
+			eq_low  = np.int64((diff == border_low) & (diff != border_high))
+			n_coincident_high += eq_high
+			n_coincident_low += eq_low
+			n_coincident += 1 - eq_high - eq_low
 
 	return n_coincident + p_high*n_coincident_high + p_low*n_coincident_low
 
 
+@numba.jit((numba.int64[:], numba.int64[:], numba.float32, numba.float32), nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def _compute_nb_coincidence_pair(spike_train1, spike_train2, max_time1, max_time2) -> tuple[float, float]:
+	"""
+	Computes compute_nb_coincidence for two windows (max_time1 <= max_time2) in a single sweep.
+	The smaller window is a subset of the bigger one, so both counts come out of one
+	pass over the pairs (used for the censored/refractory periods in the
+	cross-contamination estimate, which would otherwise sweep the spike trains twice).
+
+	@param spike_train1: array[int64] (n_spikes1)
+		The spike train of the first unit.
+	@param spike_train2: array[int64] (n_spikes2)
+		The spike train of the second unit.
+	@param max_time1: float32
+		The smaller coincidence window (in number of samples).
+	@param max_time2: float32
+		The bigger coincidence window (in number of samples).
+	@return (n_coincidence1, n_coincidence2): tuple[float, float]
+		The number of coincident spikes for each window.
+	"""
+
+	if max_time2 <= 0:
+		return 0.0, 0.0
+
+	border_low1 = -1
+	border_high1 = -1
+	p_low1 = 0.0
+	p_high1 = 0.0
+	if max_time1 > 0:
+		border_low1, border_high1, p_low1, p_high1 = _get_border_probabilities(max_time1)
+	border_low2, border_high2, p_low2, p_high2 = _get_border_probabilities(max_time2)
+
+	n_coincident1 = 0
+	n_coincident_low1 = 0
+	n_coincident_high1 = 0
+	n_coincident2 = 0
+	n_coincident_low2 = 0
+	n_coincident_high2 = 0
+
+	starts = np.searchsorted(spike_train2, spike_train1 - border_high2, side='left')
+	ends   = np.searchsorted(spike_train2, spike_train1 + border_high2, side='right')
+
+	for i in numba.prange(len(spike_train1)):
+		for j in range(starts[i], ends[i]):
+			diff = abs(spike_train1[i] - spike_train2[j])
+
+			# Branchless counter updates (see compute_nb_coincidence).
+			eq_high2 = np.int64(diff == border_high2)
+			eq_low2  = np.int64((diff == border_low2) & (diff != border_high2))
+			n_coincident_high2 += eq_high2
+			n_coincident_low2 += eq_low2
+			n_coincident2 += 1 - eq_high2 - eq_low2
+
+			in_window1 = np.int64(diff <= border_high1)
+			eq_high1 = np.int64(diff == border_high1)
+			eq_low1  = np.int64((diff == border_low1) & (diff != border_high1))
+			n_coincident_high1 += eq_high1
+			n_coincident_low1 += eq_low1
+			n_coincident1 += in_window1 - eq_high1 - eq_low1
+
+	return (n_coincident1 + p_high1*n_coincident_high1 + p_low1*n_coincident_low1,
+			n_coincident2 + p_high2*n_coincident_high2 + p_low2*n_coincident_low2)
+
+
 def compute_coincidence_matrix_from_vector(spike_vector1: np.ndarray, spike_vector2: np.ndarray, window: int, cross_shifts: np.ndarray | None = None) -> npt.NDArray[np.int64]:
 	"""
 	Computes the number of coincident spikes between two sortings (given their spike vector).
@@ -467,12 +681,14 @@ def compute_coincidence_matrix_from_vector(spike_vector1: np.ndarray, spike_vect
 	if cross_shifts is not None:
 		cross_shifts = cross_shifts.astype(np.int32)
 
-	return compute_coincidence_matrix(spike_vector1['sample_index'], spike_vector1['unit_index'],
-									  spike_vector2['sample_index'], spike_vector2['unit_index'], window, cross_shifts)
+	# Structured-array fields are strided views (one load touches two cache lines);
+	# copy them into contiguous arrays before handing them to the kernel.
+	return compute_coincidence_matrix(np.ascontiguousarray(spike_vector1['sample_index']), np.ascontiguousarray(spike_vector1['unit_index']),
+									  np.ascontiguousarray(spike_vector2['sample_index']), np.ascontiguousarray(spike_vector2['unit_index']), window, cross_shifts)
 
 
 @numba.jit((numba.int64[:], numba.int64[:], numba.int64[:], numba.int64[:], numba.int32, numba.optional(numba.int32[:, :])),
-		   nopython=True, nogil=True, cache=True)
+		   nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
 def compute_coincidence_matrix(spike_times1, spike_labels1, spike_times2, spike_labels2, max_time, cross_shifts=None) -> npt.NDArray[np.int64]:
 	"""
 	Computes the number of coincident spikes between all units in two sortings.
@@ -495,27 +711,33 @@ def compute_coincidence_matrix(spike_times1, spike_labels1, spike_times2, spike_
 		The coincidence matrix containing the number of coincident spikes between each pair of units.
 	"""
 
-	if cross_shifts is None:
+	if cross_shifts is None:  # Unwrap the optional into a concrete array for the parallel analysis.
 		n_units1 = (np.max(spike_labels1) + 1) if len(spike_labels1) > 0 else 0
 		n_units2 = (np.max(spike_labels2) + 1) if len(spike_labels2) > 0 else 0
-		cross_shifts = np.zeros((n_units1, n_units2), dtype=np.int32)
+		shifts = np.zeros((n_units1, n_units2), dtype=np.int32)
+	else:
+		shifts = cross_shifts.copy()
 
-	coincidence_matrix = np.zeros(cross_shifts.shape, dtype=np.int64)
+	# Pre-compute each spike's search window (widened by the maximum shift) so that
+	# the outer loop carries no state and can be parallelized.
+	# Each thread accumulates into its own matrix to avoid write conflicts.
+	max_shift = np.max(np.abs(shifts)) if shifts.size > 0 else 0
+	starts = np.searchsorted(spike_times2, spike_times1 - max_time - max_shift, side='left')
+	ends   = np.searchsorted(spike_times2, spike_times1 + max_time + max_shift, side='right')
 
-	start_j = 0
-	for i in range(len(spike_times1)):
-		for j in range(start_j, len(spike_times2)):
-			diff = spike_times1[i] - spike_times2[j] - cross_shifts[spike_labels1[i], spike_labels2[j]]
+	n_spikes = len(spike_times1)
+	chunk_size = (n_spikes + _N_THREADS - 1) // _N_THREADS if n_spikes > 0 else 1
+	local_matrices = np.zeros((_N_THREADS, shifts.shape[0], shifts.shape[1]), dtype=np.int64)
 
-			if diff > max_time:
-				start_j += 1
-				continue
-			if diff < -max_time:
-				break
+	for chunk in numba.prange(_N_THREADS):
+		for i in range(chunk * chunk_size, min((chunk+1) * chunk_size, n_spikes)):
+			for j in range(starts[i], ends[i]):
+				diff = spike_times1[i] - spike_times2[j] - shifts[spike_labels1[i], spike_labels2[j]]
 
-			coincidence_matrix[spike_labels1[i], spike_labels2[j]] += 1
+				if -max_time <= diff <= max_time:
+					local_matrices[chunk, spike_labels1[i], spike_labels2[j]] += 1
 
-	return coincidence_matrix
+	return np.sum(local_matrices, axis=0)
 
 
 def compute_similarity_matrix(coincidence_matrix: np.ndarray, n_spikes1: np.ndarray, n_spikes2: np.ndarray, window: float = -.5):
@@ -536,11 +758,31 @@ def compute_similarity_matrix(coincidence_matrix: np.ndarray, n_spikes1: np.ndar
 	"""
 	assert coincidence_matrix.shape == (len(n_spikes1), len(n_spikes2))
 
-	minimum_n_spikes = np.minimum(n_spikes1[:, None], n_spikes2)
-	similarity_matrix = coincidence_matrix / minimum_n_spikes
-	expected_matrix = (n_spikes1[:, None].astype(np.int64) * n_spikes2[None, :].astype(np.int64) * (2*window+1) / Utils.t_max) / minimum_n_spikes
+	coincidence_matrix = np.ascontiguousarray(coincidence_matrix, dtype=np.int64)
+	n_spikes1 = np.ascontiguousarray(n_spikes1, dtype=np.int64)
+	n_spikes2 = np.ascontiguousarray(n_spikes2, dtype=np.int64)
 
-	return (similarity_matrix - expected_matrix) / (1 - expected_matrix)
+	return _compute_similarity_matrix(coincidence_matrix, n_spikes1, n_spikes2, window, Utils.t_max)
+
+
+@numba.jit((numba.int64[:, :], numba.int64[:], numba.int64[:], numba.float64, numba.float64), nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def _compute_similarity_matrix(coincidence_matrix, n_spikes1, n_spikes2, window, t_max) -> npt.NDArray[np.float64]:
+	"""
+	Kernel for compute_similarity_matrix: computes each entry in registers
+	rather than allocating the minimum/similarity/expected intermediate matrices
+	(the computation is memory-bound for large sortings).
+	"""
+
+	similarity_matrix = np.empty(coincidence_matrix.shape, dtype=np.float64)
+	factor = (2*window + 1) / t_max
+
+	for i in numba.prange(coincidence_matrix.shape[0]):
+		for j in range(coincidence_matrix.shape[1]):
+			minimum_n_spikes = min(n_spikes1[i], n_spikes2[j])
+			expected = n_spikes1[i] * n_spikes2[j] * factor / minimum_n_spikes
+			similarity_matrix[i, j] = (coincidence_matrix[i, j] / minimum_n_spikes - expected) / (1 - expected)
+
+	return similarity_matrix
 
 
 def compute_cross_shift_from_vector(spike_vector1: np.ndarray, spike_vector2: np.ndarray, max_shift: int, gaussian_std: float = 1.5) -> npt.NDArray[np.int32]:
@@ -560,8 +802,8 @@ def compute_cross_shift_from_vector(spike_vector1: np.ndarray, spike_vector2: np
 		The cross-shift matrix containing the shift between each pair of units.
 	"""
 
-	return compute_cross_shift(spike_vector1['sample_index'].astype(np.int64, copy=False), spike_vector1['unit_index'].astype(np.int64, copy=False),
-							   spike_vector2['sample_index'].astype(np.int64, copy=False), spike_vector2['unit_index'].astype(np.int64, copy=False), max_shift, gaussian_std)
+	return compute_cross_shift(np.ascontiguousarray(spike_vector1['sample_index'], dtype=np.int64), np.ascontiguousarray(spike_vector1['unit_index'], dtype=np.int64),
+							   np.ascontiguousarray(spike_vector2['sample_index'], dtype=np.int64), np.ascontiguousarray(spike_vector2['unit_index'], dtype=np.int64), max_shift, gaussian_std)
 
 
 @numba.jit((numba.int64[:], numba.int64[:], numba.int64[:], numba.int64[:], numba.int32, numba.float32),
@@ -631,16 +873,33 @@ def filter(data: np.ndarray, band: tuple[float, float] | list[float, float] | np
 		The filtered data.
 	"""
 
+	data = np.asarray(data, dtype=np.float64)  # Both branches must return float64 (integer input would quantize and wrap).
+	axis = axis % data.ndim
 	N = data.shape[axis]
-	data_fft = np.fft.fft(data, axis=axis)
-	gaussian_highpass = _create_fft_gaussian(N, band[0])
-	gaussian_lowpass  = _create_fft_gaussian(N, band[1])
+
+	# A Gaussian frequency response with cutoff f corresponds to a convolution with a
+	# time-domain Gaussian of std fs / (2*pi*f) samples. When those kernels are short
+	# compared to the signal, a direct separable convolution is cheaper than the FFT
+	# round-trip (and doesn't allocate complex arrays).
+	sigma_highpass = Utils.sampling_frequency / (2 * math.pi * band[0])
+	sigma_lowpass  = Utils.sampling_frequency / (2 * math.pi * band[1])
+	if sigma_highpass < N / 8:
+		return scipy.ndimage.gaussian_filter1d(data, sigma_lowpass, axis=axis) - scipy.ndimage.gaussian_filter1d(data, sigma_highpass, axis=axis)
+
+	# The data is real, so use rfft/irfft (Hermitian symmetry): half the compute and memory.
+	# Pad to the next fast composite length (FFTs on lengths with large prime factors are slow)
+	# and let pocketfft parallelize across the other axes.
+	N_fast = scipy.fft.next_fast_len(N, real=True)
+	data_fft = scipy.fft.rfft(data, n=N_fast, axis=axis, workers=-1)
+	gaussian_highpass = _create_fft_gaussian(N_fast, band[0])
+	gaussian_lowpass  = _create_fft_gaussian(N_fast, band[1])
 
 	broadcast = tuple(slice(None) if i == axis else None for i in range(data_fft.ndim))
 	filtered_data_fft = data_fft * (gaussian_lowpass - gaussian_highpass)[broadcast]
-	filtered_data = np.fft.ifft(filtered_data_fft, axis=axis).real
+	filtered_data = scipy.fft.irfft(filtered_data_fft, n=N_fast, axis=axis, workers=-1)
 
-	return filtered_data
+	crop = tuple(slice(None, N) if i == axis else slice(None) for i in range(data.ndim))
+	return filtered_data[crop]
 
 
 def _create_fft_gaussian(N: int, cutoff_freq: float) -> np.ndarray:
@@ -651,19 +910,33 @@ def _create_fft_gaussian(N: int, cutoff_freq: float) -> np.ndarray:
 		The number of samples of the signal for the Fourier transform.
 	@param cutoff_freq: float
 		The cutoff frequency (in Hz).
-	@return fft_gaussian: np.ndarray
-		The Gaussian filter in the frequency domain.
+	@return fft_gaussian: np.ndarray (N//2 + 1)
+		The Gaussian filter in the frequency domain (rfft bins).
 	"""
 
-	if cutoff_freq > Utils.sampling_frequency / 8:  # The Fourier transform of a Gaussian with a very low sigma isn't a Gaussian in the Fourier domain.
-		sigma = Utils.sampling_frequency / (2 * math.pi * cutoff_freq)
+	return _create_fft_gaussian_cached(N, cutoff_freq, Utils.sampling_frequency)
+
+
+@functools.lru_cache(maxsize=64)
+def _create_fft_gaussian_cached(N: int, cutoff_freq: float, sampling_frequency: float) -> np.ndarray:
+	"""
+	Cached implementation of _create_fft_gaussian: filtering is usually called repeatedly
+	with the same band and signal length, so the kernels are computed only once.
+	The returned array is read-only (it is shared between calls).
+	"""
+
+	if cutoff_freq > sampling_frequency / 8:  # The Fourier transform of a Gaussian with a very low sigma isn't a Gaussian in the Fourier domain.
+		sigma = sampling_frequency / (2 * math.pi * cutoff_freq)
 		limit = int(round(6*sigma)) + 1
 		xaxis = np.arange(-limit, limit+1) / sigma
-		gaussian = gaussian_pdf(xaxis) / sigma
-		return np.abs(np.fft.fft(gaussian, n=N))
+		gaussian = np.exp(-0.5 * xaxis*xaxis) * (1.0 / (sigma * math.sqrt(2*math.pi)))
+		fft_gaussian = np.abs(np.fft.rfft(gaussian, n=N))
 	else:
-		freq_axis = np.fft.fftfreq(N, d=1/Utils.sampling_frequency)
-		return gaussian_pdf(freq_axis / cutoff_freq) * math.sqrt(2 * math.pi)
+		freq_axis = np.fft.rfftfreq(N, d=1/sampling_frequency)
+		fft_gaussian = np.exp(-0.5 * (freq_axis / cutoff_freq)**2)
+
+	fft_gaussian.setflags(write=False)
+	return fft_gaussian
 
 
 def compute_correlogram_difference(auto_corr1: np.ndarray, auto_corr2: np.ndarray, cross_corr: np.ndarray, n1: int, n2: int) -> float:
@@ -3,14 +3,24 @@ import pathlib
 import shutil
 import sys
 import pytest
+import numpy as np
 from lussac.core import LussacData, LussacPipeline, MonoSortingData, MultiSortingsData
 import lussac.main
+import probeinterface as pi
+import spikeinterface.core as si
 
 
 sys.path.append(str(pathlib.Path(__file__).parent.parent.absolute()))  # Otherwise the tests are not found properly with 'pytest'.
 params_path = pathlib.Path(__file__).parent / "datasets" / "cerebellar_cortex" / "params.json"
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _warm_numba() -> None:
+	# Spawn numba's thread pool once before any test runs a parallel kernel.
+	import lussac.utils.misc as misc
+	misc._numba_warmup(1024)
+
+
 @pytest.fixture(scope="session")
 def params() -> dict:
 	return lussac.main.load_json(str(params_path.resolve()))
@@ -36,6 +46,23 @@ def pipeline(data: LussacData) -> LussacPipeline:
 	return LussacPipeline(data)
 
 
+@pytest.fixture(scope="session")
+def zero_traces(tmp_path_factory: pytest.TempPathFactory) -> np.ndarray:
+	# Memory-mapped zeros: the file is sparse and pages are only faulted in when read.
+	path = tmp_path_factory.mktemp("recording") / "zero_traces.npy"
+	np.lib.format.open_memmap(path, mode='w+', dtype=np.int16, shape=(30000, 4))
+	return np.load(path, mmap_mode='r')
+
+
+@pytest.fixture(scope="session")
+def tetrode_recording(zero_traces: np.ndarray) -> si.BaseRecording:
+	# Built once for the whole session: the tests only read from it.
+	recording = si.NumpyRecording(zero_traces, sampling_frequency=30000)
+	probe = pi.generator.generate_tetrode()
+	probe.set_device_channel_indices([0, 1, 2, 3])
+	return recording.set_probe(probe)
+
+
 def pytest_collection_modifyitems(session: pytest.Session, config: pytest.Config, items: list[pytest.Item]) -> None:
 	# test "test_dataset_exists" has to be run first!
 	for item in items.copy():
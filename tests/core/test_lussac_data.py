@@ -1,22 +1,20 @@
 import os
+import stat
 import pytest
 import numba
 import numpy as np
 from lussac.core import LussacData
-import probeinterface as pi
 import spikeinterface.core as si
+from spikeinterface.core.basesorting import minimum_spike_dtype
 
 
-def test_format_params() -> None:
-	with pytest.raises(Exception):
-		LussacData._format_params({0: {}})
-	with pytest.raises(Exception):
-		LussacData._format_params({'aze': 1})
+@pytest.mark.parametrize("bad_params", [{0: {}}, {'aze': 1}, {'aze': {2: {}}}, {'aze': {'aze': 3}}])
+def test_format_params_bad(bad_params: dict) -> None:
 	with pytest.raises(Exception):
-		LussacData._format_params({'aze': {2: {}}})
-	with pytest.raises(Exception):
-		LussacData._format_params({'aze': {'aze': 3}})
+		LussacData._format_params(bad_params)
+
 
+def test_format_params() -> None:
 	params = {
 		'module': {
 			"cat1": {'a': 1},
@@ -33,18 +31,27 @@ def test_format_params() -> None:
 	assert formatted_params['module']['cat3']['b'] == 2
 
 
-def test_sanity_check() -> None:
-	recording = si.NumpyRecording(np.zeros((30000, 4), dtype=np.int16), sampling_frequency=30000)
-	probe = pi.generator.generate_tetrode()
-	probe.set_device_channel_indices([0, 1, 2, 3])
-	recording = recording.set_probe(probe)
+def test_sanity_check(tetrode_recording: si.BaseRecording) -> None:
+	recording = tetrode_recording
 
-	sortings = {
-		'correct': si.NumpySorting.from_unit_dict({0: np.array([0, 8, 7188, 29999]), 1: np.array([87, 9368, 21845])}, sampling_frequency=30000),
-		'wrong_sf': si.NumpySorting.from_unit_dict({0: np.array([0, 8, 7188, 29999]), 1: np.array([87, 9368, 21845])}, sampling_frequency=10000),
-		'wrong_name': si.NumpySorting.from_unit_dict({0: np.array([0, 8, 7188, 29999]), 1: np.array([87, 9368, 21845])}, sampling_frequency=30000),
-		'negative_st': si.NumpySorting.from_unit_dict({0: np.array([0, 8, 7188, 29999]), 1: np.array([-87, 9368, 21845])}, sampling_frequency=30000)
+	# One structured spike buffer shared by all variants (unit 0: [0, 8, 7188, 29999] ; unit 1: [87, 9368, 21845]),
+	# rather than one dict -> array conversion per sorting. The buffer must stay sorted by
+	# sample_index: the spike-vector constructor and the searchsorted-based utils rely on it.
+	spikes = np.zeros(7, dtype=minimum_spike_dtype)
+	spikes['sample_index'] = [0, 8, 87, 7188, 9368, 21845, 29999]
+	spikes['unit_index'] = [0, 0, 1, 0, 1, 1, 0]
+
+	spikes_negative = spikes.copy()
+	spikes_negative['sample_index'][2] = -87
+	spikes_negative = np.sort(spikes_negative, order='sample_index')
+
+	variants = {  # name: (spike buffer, sampling frequency)
+		'correct': (spikes, 30000),
+		'wrong_sf': (spikes, 10000),
+		'wrong_name': (spikes, 30000),
+		'negative_st': (spikes_negative, 30000)
 	}
+	sortings = {name: si.NumpySorting(spike_buffer, sampling_frequency=sf, unit_ids=[0, 1]) for name, (spike_buffer, sf) in variants.items()}
 	for name, sorting in sortings.items():
 		sorting.annotate(name=name if name != "wrong_name" else "uncorrect_name")
 
@@ -59,14 +66,47 @@ def test_sanity_check() -> None:
 			LussacData(recording, {'correct': sortings['correct'], name: sorting}, lussac_default_params)
 
 
+def test_spike_vector(tetrode_recording: si.BaseRecording) -> None:
+	spikes1 = np.zeros(4, dtype=minimum_spike_dtype)
+	spikes1['sample_index'] = [10, 500, 8_000, 25_000]
+	spikes1['unit_index'] = [0, 1, 1, 0]
+	spikes2 = np.zeros(3, dtype=minimum_spike_dtype)
+	spikes2['sample_index'] = [500, 4_000, 29_000]
+	spikes2['unit_index'] = [0, 0, 0]
+
+	sortings = {
+		'sorting1': si.NumpySorting(spikes1, sampling_frequency=30000, unit_ids=[0, 1]),
+		'sorting2': si.NumpySorting(spikes2, sampling_frequency=30000, unit_ids=[0])
+	}
+	for name, sorting in sortings.items():
+		sorting.annotate(name=name)
+
+	lussac_default_params = {'lussac': {'pipeline': {}, 'tmp_folder': "tests/tmp", 'logs_folder': "tests/tmp/logs", 'overwrite_logs': False}}
+	data = LussacData(tetrode_recording, sortings, lussac_default_params)
+
+	spike_vector = data.spike_vector
+	assert spike_vector.dtype.names == ('sample_index', 'unit_index', 'segment_index', 'sorting_index')
+	assert len(spike_vector) == 7
+	assert np.all(np.diff(spike_vector['sample_index']) >= 0)
+	assert np.all(spike_vector['sorting_index'] == (0, 0, 1, 1, 0, 0, 1))  # Stable sort: ties keep the sortings' order.
+
+	for sorting_ind, sorting in enumerate(data.sortings.values()):
+		sub_vector = spike_vector[spike_vector['sorting_index'] == sorting_ind]
+		for spike_field in ('sample_index', 'unit_index', 'segment_index'):
+			assert np.all(sub_vector[spike_field] == sorting.to_spike_vector()[spike_field])
+
+	assert data.spike_vector is spike_vector  # Computed once, then cached.
+
+
 def test_tmp_folder(data: LussacData) -> None:
-	assert os.path.exists(data.tmp_folder)
-	assert os.path.isdir(data.tmp_folder)
+	# A single stat answers both "exists" and "is a directory".
+	st = os.stat(data.tmp_folder)
+	assert stat.S_ISDIR(st.st_mode)
 
 
 def test_logs_folder(data: LussacData) -> None:
-	assert os.path.exists(data.logs_folder)
-	assert os.path.isdir(data.logs_folder)
+	st = os.stat(data.logs_folder)
+	assert stat.S_ISDIR(st.st_mode)
 
 
 def test_sampling_f(data: LussacData) -> None:
@@ -1,4 +1,5 @@
 import math
+import os
 import pytest
 from typing import Any
 import numpy as np
@@ -89,8 +90,8 @@ def test_extract_waveforms(mono_sorting_module: MonoSortingModule) -> None:
 
 	assert wvf_extractor_1 is not None
 	assert wvf_extractor_2 is not None
-	assert (tmp_folder / "test_mono_sorting_module" / "all" / "ms3_best" / "wvf_extractor" / "waveforms").is_dir()
-	assert (tmp_folder / "test_mono_sorting_module" / "all" / "ms3_best" / "aze" / "waveforms").is_dir()
+	assert os.path.isdir(os.path.join(tmp_folder, "test_mono_sorting_module", "all", "ms3_best", "wvf_extractor", "waveforms"))
+	assert os.path.isdir(os.path.join(tmp_folder, "test_mono_sorting_module", "all", "ms3_best", "aze", "waveforms"))
 
 
 def test_get_templates(mono_sorting_module: MonoSortingModule) -> None:
@@ -1,11 +1,13 @@
 import copy
 import glob
 import os
+import time
 import pytest
 from typing import Any
 import numpy as np
 from lussac.core import LussacData, LussacPipeline, MonoSortingModule, MultiSortingsModule
 import spikeinterface.core as si
+from spikeinterface.core.basesorting import minimum_spike_dtype
 from spikeinterface.core.testing import check_sortings_equal
 from spikeinterface.curation import CurationSorting
 
@@ -98,6 +100,26 @@ def test_run_mono_sorting_module(pipeline: LussacPipeline) -> None:
 		assert pipeline.data.sortings[sorting_name].get_num_units() == n_units[sorting_name]
 
 
+def test_run_mono_sorting_module_parallel(tetrode_recording: si.BaseRecording) -> None:
+	spikes = np.zeros(5, dtype=minimum_spike_dtype)
+	spikes['sample_index'] = [100, 2_000, 8_000, 15_000, 29_000]
+	spikes['unit_index'] = [0, 1, 0, 1, 0]
+
+	sortings = {}
+	for name in ("sorting_0", "sorting_1"):
+		sorting = si.NumpySorting(spikes, sampling_frequency=30000, unit_ids=[0, 1])
+		sorting.annotate(name=name)
+		sortings[name] = sorting
+
+	params = {'lussac': {'pipeline': {}, 'tmp_folder': "tests/tmp", 'logs_folder': "tests/tmp/logs", 'overwrite_logs': False}}
+	pipeline = LussacPipeline(LussacData(tetrode_recording, sortings, params))
+
+	pipeline._run_mono_sorting_module(TestParallelModule, "test_parallel_module", "all", {'n_jobs': 2})
+
+	for name in ("sorting_0", "sorting_1"):
+		assert pipeline.data.sortings[name].get_num_units() == 2
+
+
 def test_run_multi_sortings_module(pipeline: LussacPipeline) -> None:
 	pipeline = copy.deepcopy(pipeline)
 	pipeline2 = copy.deepcopy(pipeline)
@@ -207,6 +229,28 @@ class TestMonoSortingModule(MonoSortingModule):
 		return self.sorting
 
 
+class TestParallelModule(MonoSortingModule):
+	"""
+	Writes a marker in its tmp folder and finishes at a staggered time, to check that
+	a sibling instance getting garbage collected doesn't delete the shared module folder.
+	"""
+
+	__test__ = False
+
+	@property
+	def default_params(self) -> dict[str, Any]:
+		return {}
+
+	def run(self, params: dict) -> si.BaseSorting:
+		marker = self.tmp_folder / "marker"
+		marker.touch()
+
+		time.sleep(0.1 if self.data.name == "sorting_0" else 0.5)
+		assert marker.exists(), "A sibling instance deleted this module's tmp folder."
+
+		return self.sorting
+
+
 class TestMultiSortingsModule(MultiSortingsModule):
 
 	__test__ = False
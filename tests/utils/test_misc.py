@@ -88,6 +88,21 @@ def test_gaussian_histogram() -> None:
 	assert utils.gaussian_histogram(np.array([], dtype=np.float32), np.arange(0, 20 + dt, dt), 0.5).shape == np.arange(0, 20 + dt, dt).shape
 
 
+def test_gaussian_histogram_batch() -> None:
+	dt = 2e-4
+	t_axis = np.arange(0, 20 + dt, dt)
+	events_list = [np.array([3.0, 10.0, 20.0]), np.array([-40.0, 3.0, 10.0, 20.0, 50.0]), np.array([], dtype=np.float32)]
+
+	for margin_reflect in (False, True):
+		histograms = utils.gaussian_histogram_batch(events_list, t_axis, 0.5, margin_reflect=margin_reflect)
+
+		assert histograms.shape == (len(events_list), len(t_axis))
+		for events, histogram in zip(events_list, histograms):
+			assert np.allclose(histogram, utils.gaussian_histogram(events, t_axis, 0.5, margin_reflect=margin_reflect))
+
+	assert utils.gaussian_histogram_batch([], t_axis, 0.5).shape == (0, len(t_axis))
+
+
 def test_get_border_probabilities() -> None:
 	assert np.allclose(_get_border_probabilities(0.02), (0, 1, 0.0396, 0.0002))
 	assert np.allclose(_get_border_probabilities(0.4), (0, 1, 0.64, 0.08))